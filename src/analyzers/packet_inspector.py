@@ -2,12 +2,31 @@
 Packet Inspector - Core component for deep BLE packet analysis
 """
 from typing import Dict, Any, Optional, List, Tuple
+from collections import deque
 from datetime import datetime
 from pydantic import BaseModel
 from ..interfaces.base import BLEPacket
 import struct
 
 
+# Maps each byte to itself if printable ASCII, otherwise to '.'
+_PRINTABLE_TABLE = bytes(b if 32 <= b < 127 else ord('.') for b in range(256))
+
+# ATT opcodes (0x01-0x1E, plus signed/command variants). 0x01 is also the SMP
+# Pairing Request, but without CID context it is treated as ATT
+_ATT_OPCODES = frozenset(range(0x01, 0x1F)) | {0x52, 0xD2}
+
+# Protocol guess for every possible first byte of an unwrapped PDU
+_PROTOCOL_BY_FIRST_BYTE = tuple("ATT" if b in _ATT_OPCODES else "UNKNOWN" for b in range(256))
+
+# Anomaly thresholds and warnings
+_MAX_PAYLOAD_SIZE = 251  # BLE 4.2 maximum
+_MIN_PLAUSIBLE_RSSI = -100  # dBm
+_OVERSIZED_WARNING = "Packet size exceeds BLE 4.2 maximum"
+_POSITIVE_RSSI_WARNING = "Unusual RSSI value: {rssi} (positive)"
+_WEAK_SIGNAL_WARNING = "Very weak signal: {rssi} dBm"
+
+
 class InspectionResult(BaseModel):
     """Result of packet inspection"""
     packet_id: str
@@ -26,10 +45,14 @@ class InspectionResult(BaseModel):
 class PacketInspector:
     """Advanced packet analysis and debugging tool"""
     
-    def __init__(self):
+    def __init__(self, max_history: int = 1000):
         self.parsers = {}
-        self.packet_history = []
-        self.max_history = 1000
+        self.packet_history = deque(maxlen=max_history)
+    
+    @property
+    def max_history(self) -> int:
+        """Maximum number of inspection results kept (fixed at construction)"""
+        return self.packet_history.maxlen
     
     def inspect_packet(self, packet: BLEPacket) -> InspectionResult:
         """
@@ -88,11 +111,13 @@ class PacketInspector:
         if not data:
             return ""
         
+        # Hex-encode everything once; each byte is "xx " (3 chars) in the result
+        hex_all = data.hex(' ')
         lines = []
         for i in range(0, len(data), 16):
             chunk = data[i:i+16]
-            hex_part = ' '.join(f"{b:02x}" for b in chunk)
-            ascii_part = ''.join(chr(b) if 32 <= b < 127 else '.' for b in chunk)
+            hex_part = hex_all[i * 3:i * 3 + 47]
+            ascii_part = chunk.translate(_PRINTABLE_TABLE).decode('ascii')
             lines.append(f"{i:04x}: {hex_part:<48} {ascii_part}")
         
         return '\n'.join(lines)
@@ -106,34 +131,21 @@ class PacketInspector:
         if not packet.data or len(packet.data) < 1:
             return None
         
-        # Check for common BLE protocol patterns
-        first_byte = packet.data[0]
+        data = packet.data
         
         # L2CAP check first (it wraps other protocols)
-        if len(packet.data) >= 4:
-            # Check if this looks like an L2CAP packet
-            # L2CAP has length in first 2 bytes and CID in next 2
-            cid = struct.unpack("<H", packet.data[2:4])[0]
+        # L2CAP has length in first 2 bytes and CID in next 2
+        if len(data) >= 4:
+            cid = struct.unpack_from("<H", data, 2)[0]
             if cid == 0x0004:  # ATT CID
                 return "L2CAP_ATT"
-            elif cid == 0x0005:  # Signaling
+            if cid == 0x0005:  # Signaling
                 # But only if the first bytes make sense as length
-                length = struct.unpack("<H", packet.data[0:2])[0]
-                if length > 0 and length < 100:  # Reasonable L2CAP length
+                length = struct.unpack_from("<H", data, 0)[0]
+                if 0 < length < 100:  # Reasonable L2CAP length
                     return "L2CAP_SIG"
         
-        # ATT Protocol (0x01-0x1D are valid ATT opcodes, plus some in 0x50s)
-        if (0x01 <= first_byte <= 0x1E) or first_byte == 0x52 or first_byte == 0xD2:
-            return "ATT"
-        
-        # SMP (Security Manager Protocol) on CID 0x0006
-        if first_byte in [0x01, 0x02, 0x03, 0x04, 0x05, 0x06]:
-            # Could be SMP, but need more context to be sure
-            # For now, treat as ATT if it matches ATT opcodes
-            if first_byte == 0x01:  # Both ATT Error and SMP Pairing Request
-                return "ATT"
-        
-        return "UNKNOWN"
+        return _PROTOCOL_BY_FIRST_BYTE[data[0]]
     
     def _extract_basic_fields(self, packet: BLEPacket) -> Dict[str, Any]:
         """Extract basic packet fields"""
@@ -186,14 +198,14 @@ class PacketInspector:
         warnings = []
         
         # Check packet size
-        if packet.data and len(packet.data) > 251:
-            warnings.append("Packet size exceeds BLE 4.2 maximum")
+        if packet.data and len(packet.data) > _MAX_PAYLOAD_SIZE:
+            warnings.append(_OVERSIZED_WARNING)
         
         # Check RSSI
         if packet.rssi > 0:
-            warnings.append(f"Unusual RSSI value: {packet.rssi} (positive)")
-        elif packet.rssi < -100:
-            warnings.append(f"Very weak signal: {packet.rssi} dBm")
+            warnings.append(_POSITIVE_RSSI_WARNING.format(rssi=packet.rssi))
+        elif packet.rssi < _MIN_PLAUSIBLE_RSSI:
+            warnings.append(_WEAK_SIGNAL_WARNING.format(rssi=packet.rssi))
         
         # Check for malformed data
         if parsed_data.get("error"):
@@ -202,10 +214,12 @@ class PacketInspector:
         return warnings
     
     def _add_to_history(self, result: InspectionResult):
-        """Add inspection result to history"""
+        """Add inspection result to history (oldest entries drop off at max_history)"""
         self.packet_history.append(result)
-        if len(self.packet_history) > self.max_history:
-            self.packet_history.pop(0)
+    
+    def reset(self):
+        """Clear inspection history, keeping registered parsers"""
+        self.packet_history.clear()
     
     def register_parser(self, protocol: str, parser):
         """Register a protocol parser"""
@@ -1,7 +1,7 @@
 """
 BLE Protocol Parsers
 """
-from .base import ProtocolParser
+from .base import ProtocolParser, ParsedField
 from .gatt import GATTParser
 
-__all__ = ['ProtocolParser', 'GATTParser']
\ No newline at end of file
+__all__ = ['ProtocolParser', 'ParsedField', 'GATTParser']
\ No newline at end of file
@@ -7,7 +7,11 @@ import struct
 
 from .base import BLEInterface, BLEDevice, BLEPacket, DeviceType, BLEService, BLECharacteristic, BLEDescriptor
 from .channel_hopper import ChannelHopper, SmartChannelHopper
-from ..utils.serial_utils import find_ble_sniffer_port, is_port_available
+from ..utils.serial_utils import find_ble_sniffer_candidates, is_port_available
+
+# How long a single candidate port may take to open during auto-detection
+# before it is treated as unavailable; generous so slow dongles still win
+PORT_PROBE_TIMEOUT = 3.0
 
 
 class SnifferDongle(BLEInterface):
@@ -59,8 +63,32 @@ class SnifferDongle(BLEInterface):
                 self.serial_conn = None
     
     async def _auto_detect_port(self) -> Optional[str]:
-        """Auto-detect the sniffer dongle port"""
-        return find_ble_sniffer_port()
+        """
+        Auto-detect the sniffer dongle port
+        
+        All candidate ports are probed concurrently, but results are taken in
+        detection order: a later candidate is only chosen once every earlier
+        one has been found unavailable or has not opened within
+        PORT_PROBE_TIMEOUT.
+        """
+        candidates = find_ble_sniffer_candidates()
+        if not candidates:
+            return None
+        
+        probes = [asyncio.create_task(asyncio.to_thread(is_port_available, port)) for port in candidates]
+        try:
+            for port, probe in zip(candidates, probes):
+                try:
+                    if await asyncio.wait_for(probe, timeout=PORT_PROBE_TIMEOUT):
+                        return port
+                except Exception:
+                    # Probe errors and timeouts both count as unavailable
+                    continue
+            return None
+        finally:
+            # Stop waiting on probes for lower-ranked ports once a winner is found
+            for probe in probes:
+                probe.cancel()
     
     def check_connection(self) -> bool:
         """Check if the serial connection is still valid and port is available"""
@@ -1,9 +1,13 @@
 """Serial port utility functions."""
 import os
+import re
 import serial
 import serial.tools.list_ports
 from typing import Optional, List, Dict
 
+# Keywords identifying known sniffer dongles in a port description
+_SNIFFER_KEYWORDS_RE = re.compile(r'sniffer|ble|nordic|\bti\b|bluetooth', re.IGNORECASE)
+
 
 def is_port_available(port_path: str) -> bool:
     """
@@ -58,33 +62,42 @@ def get_available_serial_ports() -> List[Dict[str, str]]:
     return ports
 
 
-def find_ble_sniffer_port() -> Optional[str]:
+def find_ble_sniffer_candidates() -> List[str]:
     """
-    Auto-detect BLE sniffer dongles by looking for known keywords and VID/PID combinations.
+    List serial ports that look like BLE sniffer dongles, by known keywords and VID/PID combinations.
     
     Returns:
-        Optional[str]: The port path if a sniffer is found, None otherwise
+        List[str]: Candidate port paths in detection order (not yet verified as available)
     """
-    keywords = ['sniffer', 'ble', 'nordic', 'ti', 'bluetooth']
     known_vid_pid = [
         (0x0451, 0x16AA),  # TI CC2540
         (0x1366, 0x0105),  # Nordic nRF51
         (0x1915, 0x520F),  # Nordic nRF52
     ]
     
+    candidates = []
     for port in serial.tools.list_ports.comports():
         # Check description for keywords
-        description_lower = port.description.lower()
-        if any(keyword in description_lower for keyword in keywords):
-            # Verify the port is actually available
-            if is_port_available(port.device):
-                return port.device
-        
+        if _SNIFFER_KEYWORDS_RE.search(port.description or ''):
+            candidates.append(port.device)
         # Check VID/PID
-        if hasattr(port, 'vid') and hasattr(port, 'pid'):
-            if (port.vid, port.pid) in known_vid_pid:
-                if is_port_available(port.device):
-                    return port.device
+        elif getattr(port, 'vid', None) is not None and (port.vid, port.pid) in known_vid_pid:
+            candidates.append(port.device)
+    
+    return candidates
+
+
+def find_ble_sniffer_port() -> Optional[str]:
+    """
+    Auto-detect BLE sniffer dongles by looking for known keywords and VID/PID combinations.
+    
+    Returns:
+        Optional[str]: The port path if a sniffer is found, None otherwise
+    """
+    for port_path in find_ble_sniffer_candidates():
+        # Verify the port is actually available
+        if is_port_available(port_path):
+            return port_path
     
     return None
 
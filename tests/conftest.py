@@ -0,0 +1,25 @@
+"""
+Shared pytest configuration for the BlueFusion test suite
+"""
+import pytest
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-hardware",
+        action="store_true",
+        default=False,
+        help="run tests that need a real BLE adapter or sniffer dongle",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip hardware-marked tests unless --run-hardware was given"""
+    if config.getoption("--run-hardware"):
+        return
+    
+    skip_hardware = pytest.mark.skip(reason="needs BLE hardware (use --run-hardware)")
+    for item in items:
+        if "hardware" in item.keywords:
+            item.add_marker(skip_hardware)
+
@@ -2,6 +2,7 @@
 Tests for BLE XOR Cryptography Utilities
 """
 
+import numpy as np
 import pytest
 from src.utils.ble_crypto import (
     BLEXORDecryptor,
@@ -11,6 +12,32 @@ from src.utils.ble_crypto import (
     BLEDecryptionError
 )
 
+# Shared test vectors, built once at import
+_TEST_KEY = b"SECRET"
+_TEST_PT = b"Hello XOR World! This is a test message."
+_LONG_KEY = b"VERYLONGKEYFORTESTING"
+
+
+def _xor_bytes(data: bytes, keystream: bytes) -> bytes:
+    """XOR data against an equal-length keystream in one vectorized pass"""
+    return np.bitwise_xor(
+        np.frombuffer(data, dtype=np.uint8),
+        np.frombuffer(keystream, dtype=np.uint8)
+    ).tobytes()
+
+
+def _repeating_key_xor(data: bytes, key: bytes) -> bytes:
+    """XOR data with key, repeated or truncated to the data length"""
+    keystream = np.resize(np.frombuffer(key, dtype=np.uint8), len(data)).tobytes()
+    return _xor_bytes(data, keystream)
+
+
+def _counter_keystream(key: bytes, counter_start: int, length: int) -> bytes:
+    """Keystream for counter XOR: key byte combined with the low byte of the counter"""
+    key_bytes = np.resize(np.frombuffer(key, dtype=np.uint8), length)
+    counter_bytes = (np.arange(counter_start, counter_start + length) & 0xFF).astype(np.uint8)
+    return (key_bytes ^ counter_bytes).tobytes()
+
 
 class TestBLEXORDecryptor:
     """Test BLE XOR decryption functions"""
@@ -18,8 +45,8 @@ class TestBLEXORDecryptor:
     def setup_method(self):
         """Set up test fixtures"""
         self.decryptor = BLEXORDecryptor()
-        self.test_key = b"SECRET"
-        self.test_plaintext = b"Hello XOR World! This is a test message."
+        self.test_key = _TEST_KEY
+        self.test_plaintext = _TEST_PT
         
     def test_get_algorithm_name(self):
         """Test algorithm name reporting"""
@@ -28,11 +55,7 @@ class TestBLEXORDecryptor:
     def test_simple_xor_decrypt(self):
         """Test simple XOR decryption with repeating key"""
         # Encrypt manually
-        ciphertext = bytearray()
-        key_len = len(self.test_key)
-        for i, byte in enumerate(self.test_plaintext):
-            ciphertext.append(byte ^ self.test_key[i % key_len])
-        ciphertext = bytes(ciphertext)
+        ciphertext = _repeating_key_xor(self.test_plaintext, self.test_key)
         
         # Decrypt using our function
         result = self.decryptor.decrypt(
@@ -47,17 +70,9 @@ class TestBLEXORDecryptor:
     def test_counter_xor_decrypt(self):
         """Test XOR decryption with counter"""
         # Encrypt manually with counter
-        ciphertext = bytearray()
-        key_len = len(self.test_key)
         counter = 42  # Start counter
-        
-        for i, byte in enumerate(self.test_plaintext):
-            key_byte = self.test_key[i % key_len]
-            xor_value = key_byte ^ (counter & 0xFF)
-            ciphertext.append(byte ^ xor_value)
-            counter += 1
-        
-        ciphertext = bytes(ciphertext)
+        keystream = _counter_keystream(self.test_key, counter, len(self.test_plaintext))
+        ciphertext = _xor_bytes(self.test_plaintext, keystream)
         
         # Decrypt using our function
         result = self.decryptor.decrypt(
@@ -88,12 +103,9 @@ class TestBLEXORDecryptor:
         length = len(self.test_plaintext).to_bytes(2, 'little')
         
         # XOR encrypt the payload
-        payload_encrypted = bytearray()
-        key_len = len(self.test_key)
-        for i, byte in enumerate(self.test_plaintext):
-            payload_encrypted.append(byte ^ self.test_key[i % key_len])
+        payload_encrypted = _repeating_key_xor(self.test_plaintext, self.test_key)
         
-        full_pdu = header + length + bytes(payload_encrypted)
+        full_pdu = header + length + payload_encrypted
         
         # Decrypt
         result = self.decryptor.decrypt_ble_packet_xor(
@@ -110,17 +122,11 @@ class TestBLEXORDecryptor:
         length = len(self.test_plaintext).to_bytes(2, 'little')
         
         # XOR encrypt with counter
-        payload_encrypted = bytearray()
-        key_len = len(self.test_key)
         counter = 100
+        keystream = _counter_keystream(self.test_key, counter, len(self.test_plaintext))
+        payload_encrypted = _xor_bytes(self.test_plaintext, keystream)
         
-        for i, byte in enumerate(self.test_plaintext):
-            key_byte = self.test_key[i % key_len]
-            xor_value = key_byte ^ (counter & 0xFF)
-            payload_encrypted.append(byte ^ xor_value)
-            counter += 1
-        
-        full_pdu = header + length + bytes(payload_encrypted)
+        full_pdu = header + length + payload_encrypted
         
         # Decrypt
         result = self.decryptor.decrypt_ble_packet_xor(
@@ -153,14 +159,11 @@ class TestBLEXORDecryptor:
         plaintext = dummy_prefix + known_plain + b"MORE DATA"
         
         # Encrypt
-        ciphertext = bytearray()
-        key_len = len(key_to_find)
-        for i, byte in enumerate(plaintext):
-            ciphertext.append(byte ^ key_to_find[i % key_len])
+        ciphertext = _repeating_key_xor(plaintext, key_to_find)
         
         # Recover key
         recovered_key = self.decryptor.find_xor_key(
-            bytes(ciphertext),
+            ciphertext,
             known_plain,
             len(key_to_find),
             offset=5
@@ -174,14 +177,11 @@ class TestBLEXORDecryptor:
         key_to_find = b"LONGKEY"
         
         # Create ciphertext
-        ciphertext = bytearray()
-        key_len = len(key_to_find)
-        for i, byte in enumerate(known_plain):
-            ciphertext.append(byte ^ key_to_find[i % key_len])
+        ciphertext = _repeating_key_xor(known_plain, key_to_find)
         
         # Recover key (should repeat pattern)
         recovered_key = self.decryptor.find_xor_key(
-            bytes(ciphertext),
+            ciphertext,
             known_plain,
             len(key_to_find),
             offset=0
@@ -195,15 +195,16 @@ class TestBLEXORDecryptor:
         """Test XOR pattern analysis"""
         # Create data with repeating 4-byte key
         key = b"ABCD"
-        plaintext = b"This is a test message for pattern analysis" * 3
+        # Period length is a multiple of the key length, so encrypting one
+        # period and tiling the ciphertext equals encrypting the tiled plaintext
+        period_plain = b"This is a test message for pattern analysis "
         
         # Encrypt
-        ciphertext = bytearray()
-        for i, byte in enumerate(plaintext):
-            ciphertext.append(byte ^ key[i % len(key)])
+        period_cipher = _repeating_key_xor(period_plain, key)
+        ciphertext = period_cipher * 3
         
         # Analyze
-        analysis = self.decryptor.analyze_xor_patterns(bytes(ciphertext), max_key_length=10)
+        analysis = self.decryptor.analyze_xor_patterns(ciphertext, max_key_length=10)
         
         # Check that key length 4 is detected as likely
         assert 4 in analysis['likely_key_lengths']
@@ -217,12 +218,9 @@ class TestBLEXORDecryptor:
         header = b"\x02"
         length = len(self.test_plaintext).to_bytes(2, 'little')
         
-        payload_encrypted = bytearray()
-        key_len = len(self.test_key)
-        for i, byte in enumerate(self.test_plaintext):
-            payload_encrypted.append(byte ^ self.test_key[i % key_len])
+        payload_encrypted = _repeating_key_xor(self.test_plaintext, self.test_key)
         
-        full_pdu = header + length + bytes(payload_encrypted)
+        full_pdu = header + length + payload_encrypted
         
         result = decrypt_ble_packet_xor(self.test_key, full_pdu)
         assert result == self.test_plaintext
@@ -231,17 +229,15 @@ class TestBLEXORDecryptor:
         known_plain = b"TEST"
         key_to_find = b"MYKEY"
         
-        ciphertext = bytearray()
-        for i, byte in enumerate(known_plain):
-            ciphertext.append(byte ^ key_to_find[i % len(key_to_find)])
+        ciphertext = _repeating_key_xor(known_plain, key_to_find)
         
         recovered = find_xor_key_from_known_plaintext(
-            bytes(ciphertext), known_plain, len(key_to_find)
+            ciphertext, known_plain, len(key_to_find)
         )
         assert recovered == key_to_find
         
         # Test analyze_xor_encryption
-        analysis = analyze_xor_encryption(bytes(ciphertext))
+        analysis = analyze_xor_encryption(ciphertext)
         assert 'likely_key_lengths' in analysis
         assert 'byte_frequency' in analysis
         assert 'entropy' in analysis
@@ -252,7 +248,7 @@ class TestBLEXORDecryptor:
         plaintext = b"Single byte XOR test"
         
         # Encrypt
-        ciphertext = bytes(byte ^ key[0] for byte in plaintext)
+        ciphertext = _repeating_key_xor(plaintext, key)
         
         # Decrypt
         result = self.decryptor.decrypt(key, b"", ciphertext, None)
@@ -260,11 +256,11 @@ class TestBLEXORDecryptor:
     
     def test_key_longer_than_plaintext(self):
         """Test XOR with key longer than plaintext"""
-        key = b"VERYLONGKEYFORTESTING"
+        key = _LONG_KEY
         plaintext = b"SHORT"
         
         # Encrypt
-        ciphertext = bytes(plaintext[i] ^ key[i] for i in range(len(plaintext)))
+        ciphertext = _repeating_key_xor(plaintext, key)
         
         # Decrypt
         result = self.decryptor.decrypt(key, b"", ciphertext, None)
@@ -3,6 +3,7 @@
 Simple dual interface test without pydantic dependencies
 """
 import asyncio
+import re
 import sys
 from datetime import datetime
 import serial
@@ -12,6 +13,9 @@ import serial.tools.list_ports
 import bleak
 from bleak import BleakScanner, BleakClient
 
+# Known sniffer identifiers, matched in a single pass over each port description
+_SNIFFER_RE = re.compile(r'sniffer|ble|nordic|\bti\b|uart|usb serial', re.IGNORECASE)
+
 async def test_macbook_ble():
     """Test MacBook's native BLE"""
     print("\n=== Testing MacBook BLE ===")
@@ -61,7 +65,7 @@ async def test_sniffer_dongle():
     # Check for known sniffer identifiers
     sniffer_port = None
     for port in ports:
-        if any(keyword in port.description.lower() for keyword in ['sniffer', 'ble', 'nordic', 'ti', 'uart', 'usb serial']):
+        if _SNIFFER_RE.search(port.description or ''):
             sniffer_port = port.device
             print(f"\n✅ Potential sniffer detected on: {sniffer_port}")
             break
@@ -73,16 +77,15 @@ async def test_sniffer_dongle():
     # Try to open the port
     if sniffer_port:
         try:
-            ser = serial.Serial(sniffer_port, 115200, timeout=1)
-            print(f"✅ Successfully opened {sniffer_port}")
-            
-            # Try to send a test command
-            ser.write(b"TEST\n")
-            response = ser.read(100)
-            if response:
-                print(f"   Response: {response}")
+            with serial.Serial(sniffer_port, 115200, timeout=0.2, write_timeout=0.2) as ser:
+                print(f"✅ Successfully opened {sniffer_port}")
+                
+                # Try to send a test command; stop reading at the first line terminator
+                ser.write(b"TEST\n")
+                response = ser.read_until(expected=b'\n', size=256)
+                if response:
+                    print(f"   Response: {response}")
             
-            ser.close()
             return sniffer_port
         except Exception as e:
             print(f"⚠️  Could not communicate with {sniffer_port}: {e}")
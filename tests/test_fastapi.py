@@ -2,106 +2,149 @@
 """
 FastAPI test suite for BlueFusion API
 """
+import httpx
 import pytest
+import pytest_asyncio
 from fastapi.testclient import TestClient
-from unittest.mock import AsyncMock, MagicMock, patch
-import sys
-import os
+from types import SimpleNamespace
 
-# Add parent directory to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from src.api.fastapi_server import app, mac_ble, sniffer
+from src.api import fastapi_server
+from src.api.fastapi_server import app
 from src.interfaces.base import BLEDevice, BLEPacket, DeviceType
 from datetime import datetime
 
 
-@pytest.fixture
-def client():
-    """Create test client"""
+# HTTP tests share one event loop (and one AsyncClient) for the whole module
+asyncio_module = pytest.mark.asyncio(loop_scope="module")
+
+
+def _async_return(value=None):
+    """Async stub returning value and recording (args, kwargs) of every call"""
+    async def _stub(*args, **kwargs):
+        _stub.calls.append((args, kwargs))
+        return value
+    _stub.calls = []
+    return _stub
+
+
+def _sync_return(value=None):
+    """Sync stub returning value and recording (args, kwargs) of every call"""
+    def _stub(*args, **kwargs):
+        _stub.calls.append((args, kwargs))
+        return value
+    _stub.calls = []
+    return _stub
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def client():
+    """Async client dispatching straight to the ASGI app, shared by the module"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+        yield async_client
+
+
+@pytest.fixture(scope="module")
+def ws_client():
+    """Sync test client for WebSocket tests (httpx has no WebSocket support)"""
+    # Not entered as a context manager, so the app lifespan (real BLE and
+    # sniffer initialization) never runs
     return TestClient(app)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
+def ws(ws_client, patch_globals):
+    """One /stream WebSocket session shared by the module's websocket tests"""
+    with ws_client.websocket_connect("/stream") as websocket:
+        yield websocket
+
+
+@pytest.fixture(scope="module")
 def mock_mac_ble():
     """Mock MacBook BLE interface"""
-    mock = AsyncMock()
-    mock.is_running = False
-    mock.initialize = AsyncMock()
-    mock.start_scanning = AsyncMock()
-    mock.stop_scanning = AsyncMock()
-    mock.get_devices = AsyncMock(return_value=[
-        BLEDevice(
-            address="00:11:22:33:44:55",
-            name="Test Device",
-            rssi=-50,
-            services=["180A", "180F"]
-        )
-    ])
-    mock.connect = AsyncMock(return_value=True)
-    mock.disconnect = AsyncMock()
-    mock.read_characteristic = AsyncMock(return_value=b"test_data")
-    return mock
+    return SimpleNamespace(
+        is_running=False,
+        initialize=_async_return(),
+        start_scanning=_async_return(),
+        stop_scanning=_async_return(),
+        get_devices=_async_return([
+            BLEDevice(
+                address="00:11:22:33:44:55",
+                name="Test Device",
+                rssi=-50,
+                services=["180A", "180F"]
+            )
+        ]),
+        connect=_async_return(True),
+        disconnect=_async_return(),
+        read_characteristic=_async_return(b"test_data"),
+        register_callback=_sync_return(),
+    )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_sniffer():
     """Mock Sniffer interface"""
-    mock = AsyncMock()
-    mock.is_running = False
-    mock.serial_conn = MagicMock()
-    mock.port = "/dev/cu.test"
-    mock.initialize = AsyncMock()
-    mock.start_scanning = AsyncMock()
-    mock.stop_scanning = AsyncMock()
-    mock.get_devices = AsyncMock(return_value=[
-        BLEDevice(
-            address="AA:BB:CC:DD:EE:FF",
-            name=None,
-            rssi=-60,
-            raw_data=b"\x00\x01\x02\x03"
-        )
-    ])
-    mock.set_channel = AsyncMock()
-    mock.set_follow_mode = AsyncMock()
-    return mock
+    return SimpleNamespace(
+        is_running=False,
+        serial_conn=object(),  # only truthiness is checked by the server
+        port="/dev/cu.test",
+        is_connected=lambda: True,
+        initialize=_async_return(),
+        start_scanning=_async_return(),
+        stop_scanning=_async_return(),
+        get_devices=_async_return([
+            BLEDevice(
+                address="AA:BB:CC:DD:EE:FF",
+                name=None,
+                rssi=-60,
+                raw_data=b"\x00\x01\x02\x03"
+            )
+        ]),
+        set_channel=_async_return(),
+        set_follow_mode=_async_return(),
+        register_callback=_sync_return(),
+    )
+
 
+@pytest.fixture(scope="module", autouse=True)
+def patch_globals(mock_mac_ble, mock_sniffer):
+    """Install the mock interfaces as the server's global instances for the module"""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(fastapi_server, "mac_ble", mock_mac_ble)
+        mp.setattr(fastapi_server, "sniffer", mock_sniffer)
+        yield
 
+
+@asyncio_module
 class TestBasicEndpoints:
     """Test basic API endpoints"""
     
-    def test_root(self, client):
+    async def test_root(self, client):
         """Test root endpoint"""
-        response = client.get("/")
+        response = await client.get("/")
         assert response.status_code == 200
         data = response.json()
         assert data["status"] == "online"
         assert data["api"] == "BlueFusion"
         assert "interfaces" in data
     
-    def test_interfaces_status(self, client):
+    async def test_interfaces_status(self, client):
         """Test interfaces status endpoint"""
-        response = client.get("/interfaces/status")
+        response = await client.get("/interfaces/status")
         assert response.status_code == 200
         data = response.json()
         assert "macbook" in data
         assert "sniffer" in data
 
 
+@asyncio_module
 class TestScanningEndpoints:
     """Test scanning control endpoints"""
     
-    @patch('main.mac_ble')
-    @patch('main.sniffer')
-    def test_start_scanning_both(self, mock_sniff, mock_mac, client, mock_mac_ble, mock_sniffer):
+    async def test_start_scanning_both(self, client):
         """Test starting scan on both interfaces"""
-        mock_mac.__bool__.return_value = True
-        mock_mac.start_scanning = mock_mac_ble.start_scanning
-        mock_sniff.__bool__.return_value = True
-        mock_sniff.serial_conn = mock_sniffer.serial_conn
-        mock_sniff.start_scanning = mock_sniffer.start_scanning
-        
-        response = client.post("/scan/start", json={
+        response = await client.post("/scan/start", params={
             "interface": "both",
             "mode": "active"
         })
@@ -112,51 +155,35 @@ class TestScanningEndpoints:
         assert "macbook" in data["interfaces"]
         assert "sniffer" in data["interfaces"]
     
-    @patch('main.mac_ble')
-    def test_start_scanning_macbook_only(self, mock_mac, client, mock_mac_ble):
+    async def test_start_scanning_macbook_only(self, client, mock_mac_ble):
         """Test starting scan on MacBook only"""
-        mock_mac.__bool__.return_value = True
-        mock_mac.start_scanning = mock_mac_ble.start_scanning
-        
-        response = client.post("/scan/start", json={
+        response = await client.post("/scan/start", params={
             "interface": "macbook",
             "mode": "passive"
         })
         
         assert response.status_code == 200
-        mock_mac_ble.start_scanning.assert_called_with(passive=True)
+        assert mock_mac_ble.start_scanning.calls[-1] == ((), {"passive": True})
     
-    @patch('main.mac_ble')
-    @patch('main.sniffer')
-    def test_stop_scanning(self, mock_sniff, mock_mac, client, mock_mac_ble, mock_sniffer):
+    async def test_stop_scanning(self, client, monkeypatch, mock_mac_ble, mock_sniffer):
         """Test stopping scan"""
-        mock_mac.__bool__.return_value = True
-        mock_mac.is_running = True
-        mock_mac.stop_scanning = mock_mac_ble.stop_scanning
-        mock_sniff.__bool__.return_value = True
-        mock_sniff.is_running = True
-        mock_sniff.stop_scanning = mock_sniffer.stop_scanning
+        monkeypatch.setattr(mock_mac_ble, "is_running", True)
+        monkeypatch.setattr(mock_sniffer, "is_running", True)
         
-        response = client.post("/scan/stop")
+        response = await client.post("/scan/stop")
         
         assert response.status_code == 200
         data = response.json()
         assert data["status"] == "scanning stopped"
 
 
+@asyncio_module
 class TestDeviceEndpoints:
     """Test device-related endpoints"""
     
-    @patch('main.mac_ble')
-    @patch('main.sniffer')
-    def test_get_devices(self, mock_sniff, mock_mac, client, mock_mac_ble, mock_sniffer):
+    async def test_get_devices(self, client):
         """Test getting discovered devices"""
-        mock_mac.__bool__.return_value = True
-        mock_mac.get_devices = mock_mac_ble.get_devices
-        mock_sniff.__bool__.return_value = True
-        mock_sniff.get_devices = mock_sniffer.get_devices
-        
-        response = client.get("/devices")
+        response = await client.get("/devices")
         
         assert response.status_code == 200
         data = response.json()
@@ -166,38 +193,26 @@ class TestDeviceEndpoints:
         assert data["macbook"][0]["address"] == "00:11:22:33:44:55"
         assert data["macbook"][0]["name"] == "Test Device"
     
-    @patch('main.mac_ble')
-    def test_connect_device(self, mock_mac, client, mock_mac_ble):
+    async def test_connect_device(self, client):
         """Test connecting to a device"""
-        mock_mac.__bool__.return_value = True
-        mock_mac.connect = mock_mac_ble.connect
-        
-        response = client.post("/connect/00:11:22:33:44:55")
+        response = await client.post("/connect/00:11:22:33:44:55")
         
         assert response.status_code == 200
         data = response.json()
         assert data["status"] == "connected"
         assert data["address"] == "00:11:22:33:44:55"
     
-    @patch('main.mac_ble')
-    def test_disconnect_device(self, mock_mac, client, mock_mac_ble):
+    async def test_disconnect_device(self, client):
         """Test disconnecting from a device"""
-        mock_mac.__bool__.return_value = True
-        mock_mac.disconnect = mock_mac_ble.disconnect
-        
-        response = client.post("/disconnect/00:11:22:33:44:55")
+        response = await client.post("/disconnect/00:11:22:33:44:55")
         
         assert response.status_code == 200
         data = response.json()
         assert data["status"] == "disconnected"
     
-    @patch('main.mac_ble')
-    def test_read_characteristic(self, mock_mac, client, mock_mac_ble):
+    async def test_read_characteristic(self, client):
         """Test reading a characteristic"""
-        mock_mac.__bool__.return_value = True
-        mock_mac.read_characteristic = mock_mac_ble.read_characteristic
-        
-        response = client.get("/read/00:11:22:33:44:55/00002a00-0000-1000-8000-00805f9b34fb")
+        response = await client.get("/read/00:11:22:33:44:55/00002a00-0000-1000-8000-00805f9b34fb")
         
         assert response.status_code == 200
         data = response.json()
@@ -205,58 +220,47 @@ class TestDeviceEndpoints:
         assert data["length"] == 9
 
 
+@asyncio_module
 class TestSnifferEndpoints:
     """Test sniffer-specific endpoints"""
     
-    @patch('main.sniffer')
-    def test_set_channel(self, mock_sniff, client, mock_sniffer):
+    async def test_set_channel(self, client, mock_sniffer):
         """Test setting sniffer channel"""
-        mock_sniff.__bool__.return_value = True
-        mock_sniff.serial_conn = mock_sniffer.serial_conn
-        mock_sniff.set_channel = mock_sniffer.set_channel
-        
-        response = client.post("/sniffer/channel/37")
+        response = await client.post("/sniffer/channel/37")
         
         assert response.status_code == 200
         data = response.json()
         assert data["channel"] == 37
-        mock_sniffer.set_channel.assert_called_with(37)
+        assert mock_sniffer.set_channel.calls[-1] == ((37,), {})
     
-    @patch('main.sniffer')
-    def test_set_channel_invalid(self, mock_sniff, client):
+    async def test_set_channel_invalid(self, client):
         """Test setting invalid channel"""
-        mock_sniff.__bool__.return_value = True
-        mock_sniff.serial_conn = MagicMock()
-        
-        response = client.post("/sniffer/channel/40")
+        response = await client.post("/sniffer/channel/40")
         
         assert response.status_code == 400
         assert "Channel must be between 0-39" in response.json()["detail"]
     
-    @patch('main.sniffer')
-    def test_follow_device(self, mock_sniff, client, mock_sniffer):
+    async def test_follow_device(self, client, mock_sniffer):
         """Test following a device"""
-        mock_sniff.__bool__.return_value = True
-        mock_sniff.serial_conn = mock_sniffer.serial_conn
-        mock_sniff.set_follow_mode = mock_sniffer.set_follow_mode
-        
-        response = client.post("/sniffer/follow/AA:BB:CC:DD:EE:FF")
+        response = await client.post("/sniffer/follow/AA:BB:CC:DD:EE:FF")
         
         assert response.status_code == 200
         data = response.json()
         assert data["status"] == "following device"
-        mock_sniffer.set_follow_mode.assert_called_with("AA:BB:CC:DD:EE:FF")
+        assert mock_sniffer.set_follow_mode.calls[-1] == (("AA:BB:CC:DD:EE:FF",), {})
 
 
 class TestWebSocket:
     """Test WebSocket endpoint"""
     
-    def test_websocket_connection(self, client):
-        """Test WebSocket connection"""
-        with client.websocket_connect("/stream") as websocket:
-            # Connection should be established
-            # In a real test, we'd send packets and verify they're received
-            websocket.close()
+    def test_websocket_connection(self, ws, mock_mac_ble, mock_sniffer):
+        """Test WebSocket connection registers packet callbacks on both interfaces"""
+        # Connection is established by the shared fixture
+        for interface in (mock_mac_ble, mock_sniffer):
+            (callback,), _ = interface.register_callback.calls[-1]
+            assert callable(callback)
+        
+        ws.send_text("ping")
 
 
 if __name__ == "__main__":
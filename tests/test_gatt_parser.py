@@ -2,123 +2,124 @@
 Tests for GATT Protocol Parser
 """
 import pytest
-from src.analyzers.protocol_parsers import GATTParser
+from src.analyzers.protocol_parsers import GATTParser, ParsedField
+
+
+# Structured fields expected for a Read Request of handle 0x0003
+READ_REQUEST_FIELDS = [
+    ParsedField(name="Opcode", value="Read Request", offset=0, size=1,
+                description="ATT operation code: 0x0A"),
+    ParsedField(name="Handle", value="0x0003", offset=1, size=2,
+                description="Attribute handle to read"),
+]
+
+
+# (raw PDU, expected subset of parse() output, expected parse_fields() output or None)
+GATT_CASES = [
+    # Read Request for handle 0x0003
+    (bytes([0x0A, 0x03, 0x00]), {
+        "opcode": 0x0A,
+        "opcode_name": "Read Request",
+        "handle": "0x0003",
+    }, READ_REQUEST_FIELDS),
+    # Read Response with value "Hello"
+    (bytes([0x0B]) + b"Hello", {
+        "opcode": 0x0B,
+        "opcode_name": "Read Response",
+        "value": "48656c6c6f",  # "Hello" in hex
+        "value_length": 5,
+        "value_ascii": "Hello",
+    }, None),
+    # Write Request to handle 0x0010 with value [0x01, 0x02]
+    (bytes([0x12, 0x10, 0x00, 0x01, 0x02]), {
+        "opcode": 0x12,
+        "opcode_name": "Write Request",
+        "handle": "0x0010",
+        "value": "0102",
+        "value_length": 2,
+    }, None),
+    # Error Response: Read not permitted for handle 0x0005
+    (bytes([0x01, 0x0A, 0x05, 0x00, 0x02]), {
+        "opcode": 0x01,
+        "opcode_name": "Error Response",
+        "request_opcode": 0x0A,
+        "request_opcode_name": "Read Request",
+        "handle": "0x0005",
+        "error_code": 0x02,
+        "error_name": "Read Not Permitted",
+    }, None),
+    # MTU Request with MTU=512 (little endian)
+    (bytes([0x02, 0x00, 0x02]), {
+        "opcode": 0x02,
+        "opcode_name": "Exchange MTU Request",
+        "client_mtu": 512,
+    }, None),
+    # MTU Response with MTU=256 (little endian)
+    (bytes([0x03, 0x00, 0x01]), {
+        "opcode": 0x03,
+        "opcode_name": "Exchange MTU Response",
+        "server_mtu": 256,
+    }, None),
+    # Notification from handle 0x0025 with value [0xAA, 0xBB]
+    (bytes([0x1B, 0x25, 0x00, 0xAA, 0xBB]), {
+        "opcode": 0x1B,
+        "opcode_name": "Handle Value Notification",
+        "handle": "0x0025",
+        "value": "aabb",
+        "value_length": 2,
+    }, None),
+]
+GATT_CASE_IDS = [
+    "read_request",
+    "read_response",
+    "write_request",
+    "error_response",
+    "mtu_request",
+    "mtu_response",
+    "notification",
+]
+
+
+def assert_subset(sub: dict, sup: dict):
+    """Assert every key/value pair of sub is present in sup"""
+    assert sub.items() <= sup.items(), {k: sup.get(k) for k in sub}
+
+
+@pytest.fixture(scope="module")
+def parser():
+    """Create a GATT parser instance shared by the module (parsing is stateless)"""
+    return GATTParser()
 
 
 class TestGATTParser:
     """Test GATT parser functionality"""
     
-    @pytest.fixture
-    def parser(self):
-        """Create a GATT parser instance"""
-        return GATTParser()
-    
     def test_parser_creation(self, parser):
         """Test parser initialization"""
         assert parser is not None
         assert parser.name == "GATTParser"
     
-    def test_can_parse_valid_att(self, parser):
-        """Test ATT packet detection"""
+    @pytest.mark.parametrize("payload,expected", [
         # Valid ATT opcodes
-        assert parser.can_parse(bytes([0x0A]))  # Read Request
-        assert parser.can_parse(bytes([0x12]))  # Write Request
-        assert parser.can_parse(bytes([0x1B]))  # Notification
-        
+        (bytes([0x0A]), True),  # Read Request
+        (bytes([0x12]), True),  # Write Request
+        (bytes([0x1B]), True),  # Notification
         # Invalid opcodes
-        assert not parser.can_parse(bytes([0x00]))
-        assert not parser.can_parse(bytes([0xFF]))
-        assert not parser.can_parse(bytes())
-    
-    def test_parse_read_request(self, parser):
-        """Test Read Request parsing"""
-        # Read Request for handle 0x0003
-        data = bytes([0x0A, 0x03, 0x00])
-        result = parser.parse(data)
-        
-        assert result["opcode"] == 0x0A
-        assert result["opcode_name"] == "Read Request"
-        assert result["handle"] == "0x0003"
-    
-    def test_parse_read_response(self, parser):
-        """Test Read Response parsing"""
-        # Read Response with value "Hello"
-        data = bytes([0x0B]) + b"Hello"
-        result = parser.parse(data)
-        
-        assert result["opcode"] == 0x0B
-        assert result["opcode_name"] == "Read Response"
-        assert result["value"] == "48656c6c6f"  # "Hello" in hex
-        assert result["value_length"] == 5
-        assert result["value_ascii"] == "Hello"
-    
-    def test_parse_write_request(self, parser):
-        """Test Write Request parsing"""
-        # Write Request to handle 0x0010 with value [0x01, 0x02]
-        data = bytes([0x12, 0x10, 0x00, 0x01, 0x02])
-        result = parser.parse(data)
-        
-        assert result["opcode"] == 0x12
-        assert result["opcode_name"] == "Write Request"
-        assert result["handle"] == "0x0010"
-        assert result["value"] == "0102"
-        assert result["value_length"] == 2
-    
-    def test_parse_error_response(self, parser):
-        """Test Error Response parsing"""
-        # Error Response: Read not permitted for handle 0x0005
-        data = bytes([0x01, 0x0A, 0x05, 0x00, 0x02])
-        result = parser.parse(data)
-        
-        assert result["opcode"] == 0x01
-        assert result["opcode_name"] == "Error Response"
-        assert result["request_opcode"] == 0x0A
-        assert result["request_opcode_name"] == "Read Request"
-        assert result["handle"] == "0x0005"
-        assert result["error_code"] == 0x02
-        assert result["error_name"] == "Read Not Permitted"
-    
-    def test_parse_mtu_exchange(self, parser):
-        """Test MTU Exchange parsing"""
-        # MTU Request with MTU=512
-        req_data = bytes([0x02, 0x00, 0x02])  # 512 in little endian
-        req_result = parser.parse(req_data)
-        
-        assert req_result["opcode"] == 0x02
-        assert req_result["opcode_name"] == "Exchange MTU Request"
-        assert req_result["client_mtu"] == 512
-        
-        # MTU Response with MTU=256
-        resp_data = bytes([0x03, 0x00, 0x01])  # 256 in little endian
-        resp_result = parser.parse(resp_data)
-        
-        assert resp_result["opcode"] == 0x03
-        assert resp_result["opcode_name"] == "Exchange MTU Response"
-        assert resp_result["server_mtu"] == 256
-    
-    def test_parse_notification(self, parser):
-        """Test Handle Value Notification parsing"""
-        # Notification from handle 0x0025 with value [0xAA, 0xBB]
-        data = bytes([0x1B, 0x25, 0x00, 0xAA, 0xBB])
-        result = parser.parse(data)
-        
-        assert result["opcode"] == 0x1B
-        assert result["opcode_name"] == "Handle Value Notification"
-        assert result["handle"] == "0x0025"
-        assert result["value"] == "aabb"
-        assert result["value_length"] == 2
+        (bytes([0x00]), False),
+        (bytes([0xFF]), False),
+        (bytes(), False),
+    ], ids=["read_request", "write_request", "notification", "0x00", "0xff", "empty"])
+    def test_can_parse(self, parser, payload, expected):
+        """Test ATT packet detection"""
+        assert parser.can_parse(payload) is expected
     
-    def test_parse_fields(self, parser):
-        """Test structured field parsing"""
-        # Read Request
-        data = bytes([0x0A, 0x03, 0x00])
-        fields = parser.parse_fields(data)
+    @pytest.mark.parametrize("data,expected,expected_fields", GATT_CASES, ids=GATT_CASE_IDS)
+    def test_parse(self, parser, data, expected, expected_fields):
+        """Test parsing of individual ATT PDUs, and structured fields where given"""
+        assert_subset(expected, parser.parse(data))
         
-        assert len(fields) == 2
-        assert fields[0].name == "Opcode"
-        assert fields[0].value == "Read Request"
-        assert fields[1].name == "Handle"
-        assert fields[1].value == "0x0003"
+        if expected_fields is not None:
+            assert parser.parse_fields(data) == expected_fields
     
     def test_safe_ascii_conversion(self, parser):
         """Test safe ASCII conversion"""
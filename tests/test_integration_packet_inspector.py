@@ -7,24 +7,70 @@ from src.analyzers import PacketInspector
 from src.analyzers.protocol_parsers import GATTParser
 from src.interfaces.base import BLEPacket, DeviceType
 
+# Fixed timestamp for test packets; the inspector does not depend on wall time
+_NOW = datetime(2024, 1, 1, 0, 0, 0)
+
+# Packets for the statistics test: two ATT requests and one advertisement
+_STATS_PACKETS = (
+    # Read Requests
+    BLEPacket(
+        timestamp=_NOW,
+        source=DeviceType.MACBOOK_BLE,
+        address="AA:BB:CC:DD:EE:FF",
+        rssi=-65,
+        data=bytes([0x0A, 0x03, 0x00]),
+        packet_type="data"
+    ),
+    # Write Request
+    BLEPacket(
+        timestamp=_NOW,
+        source=DeviceType.MACBOOK_BLE,
+        address="AA:BB:CC:DD:EE:FF",
+        rssi=-65,
+        data=bytes([0x12, 0x10, 0x00, 0x01]),
+        packet_type="data"
+    ),
+    # Advertisement
+    BLEPacket(
+        timestamp=_NOW,
+        source=DeviceType.SNIFFER_DONGLE,
+        address="11:22:33:44:55:66",
+        rssi=-80,
+        data=bytes([0x02, 0x01, 0x06]),
+        packet_type="advertisement"
+    ),
+)
+
+
+def _make_gatt_inspector() -> PacketInspector:
+    """Create a packet inspector with GATT parser"""
+    inspector = PacketInspector()
+    gatt_parser = GATTParser()
+    inspector.register_parser("ATT", gatt_parser)
+    inspector.register_parser("L2CAP_ATT", gatt_parser)
+    return inspector
+
+
+@pytest.fixture(scope="module")
+def inspector_shared():
+    """Inspector shared by tests that only look at per-packet results"""
+    return _make_gatt_inspector()
+
+
+@pytest.fixture
+def inspector_fresh():
+    """Inspector with empty history, for tests that check accumulated statistics"""
+    return _make_gatt_inspector()
+
 
 class TestPacketInspectorIntegration:
     """Test packet inspector integration with parsers"""
     
-    @pytest.fixture
-    def inspector_with_gatt(self):
-        """Create a packet inspector with GATT parser"""
-        inspector = PacketInspector()
-        gatt_parser = GATTParser()
-        inspector.register_parser("ATT", gatt_parser)
-        inspector.register_parser("L2CAP_ATT", gatt_parser)
-        return inspector
-    
-    def test_gatt_packet_inspection(self, inspector_with_gatt):
+    def test_gatt_packet_inspection(self, inspector_shared):
         """Test full inspection of GATT packet"""
         # Create a Read Request packet
         packet = BLEPacket(
-            timestamp=datetime.now(),
+            timestamp=_NOW,
             source=DeviceType.MACBOOK_BLE,
             address="AA:BB:CC:DD:EE:FF",
             rssi=-65,
@@ -32,7 +78,7 @@ class TestPacketInspectorIntegration:
             packet_type="data"
         )
         
-        result = inspector_with_gatt.inspect_packet(packet)
+        result = inspector_shared.inspect_packet(packet)
         
         # Basic inspection results
         assert result.protocol == "ATT"
@@ -48,11 +94,11 @@ class TestPacketInspectorIntegration:
         # Hex dump
         assert "0000: 0a 03 00" in result.raw_hex
     
-    def test_notification_packet_inspection(self, inspector_with_gatt):
+    def test_notification_packet_inspection(self, inspector_shared):
         """Test inspection of notification packet"""
         # Heart rate notification
         packet = BLEPacket(
-            timestamp=datetime.now(),
+            timestamp=_NOW,
             source=DeviceType.SNIFFER_DONGLE,
             address="11:22:33:44:55:66",
             rssi=-70,
@@ -60,7 +106,7 @@ class TestPacketInspectorIntegration:
             packet_type="data"
         )
         
-        result = inspector_with_gatt.inspect_packet(packet)
+        result = inspector_shared.inspect_packet(packet)
         
         assert result.protocol == "ATT"
         assert result.parsed_data["opcode_name"] == "Handle Value Notification"
@@ -68,11 +114,11 @@ class TestPacketInspectorIntegration:
         assert result.parsed_data["value"] == "0056"
         assert len(result.warnings) == 0
     
-    def test_error_packet_inspection(self, inspector_with_gatt):
+    def test_error_packet_inspection(self, inspector_shared):
         """Test inspection of error response"""
         # Error: Read not permitted
         packet = BLEPacket(
-            timestamp=datetime.now(),
+            timestamp=_NOW,
             source=DeviceType.MACBOOK_BLE,
             address="AA:BB:CC:DD:EE:FF",
             rssi=-65,
@@ -80,18 +126,18 @@ class TestPacketInspectorIntegration:
             packet_type="data"
         )
         
-        result = inspector_with_gatt.inspect_packet(packet)
+        result = inspector_shared.inspect_packet(packet)
         
         assert result.protocol == "ATT"
         assert result.parsed_data["opcode_name"] == "Error Response"
         assert result.parsed_data["error_name"] == "Read Not Permitted"
         assert result.parsed_data["handle"] == "0x0005"
     
-    def test_l2cap_wrapped_att_packet(self, inspector_with_gatt):
+    def test_l2cap_wrapped_att_packet(self, inspector_shared):
         """Test L2CAP wrapped ATT packet"""
         # L2CAP header (length=3, CID=0x0004) + ATT Read Request
         packet = BLEPacket(
-            timestamp=datetime.now(),
+            timestamp=_NOW,
             source=DeviceType.SNIFFER_DONGLE,
             address="AA:BB:CC:DD:EE:FF",
             rssi=-65,
@@ -99,17 +145,17 @@ class TestPacketInspectorIntegration:
             packet_type="data"
         )
         
-        result = inspector_with_gatt.inspect_packet(packet)
+        result = inspector_shared.inspect_packet(packet)
         
         # Should detect L2CAP_ATT protocol
         assert result.protocol == "L2CAP_ATT"
         # Parser should handle the L2CAP wrapped data
         # (In a real implementation, we'd strip L2CAP header first)
     
-    def test_security_flags_with_pairing(self, inspector_with_gatt):
+    def test_security_flags_with_pairing(self, inspector_shared):
         """Test security analysis with pairing request"""
         packet = BLEPacket(
-            timestamp=datetime.now(),
+            timestamp=_NOW,
             source=DeviceType.MACBOOK_BLE,
             address="AA:BB:CC:DD:EE:FF",
             rssi=-65,
@@ -117,58 +163,28 @@ class TestPacketInspectorIntegration:
             packet_type="data"
         )
         
-        result = inspector_with_gatt.inspect_packet(packet)
+        result = inspector_shared.inspect_packet(packet)
         
         assert result.security_flags["pairing_request"] is True
         assert result.protocol == "ATT"  # 0x01 is also Error Response opcode
     
-    def test_statistics_with_multiple_packets(self, inspector_with_gatt):
+    def test_statistics_with_multiple_packets(self, inspector_fresh):
         """Test statistics gathering"""
-        packets = [
-            # Read Requests
-            BLEPacket(
-                timestamp=datetime.now(),
-                source=DeviceType.MACBOOK_BLE,
-                address="AA:BB:CC:DD:EE:FF",
-                rssi=-65,
-                data=bytes([0x0A, 0x03, 0x00]),
-                packet_type="data"
-            ),
-            # Write Request
-            BLEPacket(
-                timestamp=datetime.now(),
-                source=DeviceType.MACBOOK_BLE,
-                address="AA:BB:CC:DD:EE:FF",
-                rssi=-65,
-                data=bytes([0x12, 0x10, 0x00, 0x01]),
-                packet_type="data"
-            ),
-            # Advertisement
-            BLEPacket(
-                timestamp=datetime.now(),
-                source=DeviceType.SNIFFER_DONGLE,
-                address="11:22:33:44:55:66",
-                rssi=-80,
-                data=bytes([0x02, 0x01, 0x06]),
-                packet_type="advertisement"
-            ),
-        ]
-        
-        for packet in packets:
-            inspector_with_gatt.inspect_packet(packet)
-        
-        stats = inspector_with_gatt.get_statistics()
+        for packet in _STATS_PACKETS:
+            inspector_fresh.inspect_packet(packet)
+        
+        stats = inspector_fresh.get_statistics()
         
         assert stats["total_packets"] == 3
         assert stats["protocols"]["ATT"] == 2
         assert stats["protocols"]["ADV"] == 1
         assert stats["warnings_count"] == 0
     
-    def test_malformed_packet_handling(self, inspector_with_gatt):
+    def test_malformed_packet_handling(self, inspector_shared):
         """Test handling of malformed packets"""
         # Truncated write request (missing value)
         packet = BLEPacket(
-            timestamp=datetime.now(),
+            timestamp=_NOW,
             source=DeviceType.MACBOOK_BLE,
             address="AA:BB:CC:DD:EE:FF",
             rssi=-65,
@@ -176,21 +192,20 @@ class TestPacketInspectorIntegration:
             packet_type="data"
         )
         
-        result = inspector_with_gatt.inspect_packet(packet)
+        result = inspector_shared.inspect_packet(packet)
         
         assert result.protocol == "ATT"
         # Should have error in parsed data
         assert "error" in result.parsed_data or "payload" in result.parsed_data
     
-    def test_high_entropy_encryption_detection(self, inspector_with_gatt):
+    def test_high_entropy_encryption_detection(self, inspector_shared):
         """Test encryption detection"""
         # High entropy data that looks encrypted
         import random
-        random.seed(42)
-        encrypted_data = bytes([random.randint(0, 255) for _ in range(32)])
+        encrypted_data = random.Random(42).randbytes(32)
         
         packet = BLEPacket(
-            timestamp=datetime.now(),
+            timestamp=_NOW,
             source=DeviceType.SNIFFER_DONGLE,
             address="AA:BB:CC:DD:EE:FF",
             rssi=-65,
@@ -198,7 +213,7 @@ class TestPacketInspectorIntegration:
             packet_type="data"
         )
         
-        result = inspector_with_gatt.inspect_packet(packet)
+        result = inspector_shared.inspect_packet(packet)
         
         # Should detect possible encryption
         assert result.security_flags["encrypted"] is True
\ No newline at end of file
@@ -1,9 +1,17 @@
 #!/usr/bin/env python3
 import asyncio
 import sys
+import pytest
 from datetime import datetime
 from src.interfaces.macbook_ble import MacBookBLE
 
+# Share one event loop across the session instead of a fresh asyncio.run() per test
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+SCAN_TIMEOUT = 10.0
+TARGET_DEVICES = 5
+
+@pytest.mark.hardware
 async def test_macbook_scanner():
     print("=== BlueFusion MacBook BLE Test ===")
     print(f"Starting at {datetime.now()}\n")
@@ -15,8 +23,15 @@ async def test_macbook_scanner():
     print("Initializing MacBook BLE interface...")
     await mac_ble.initialize()
     
+    # Stop waiting as soon as enough distinct devices have been seen
+    seen = set()
+    scan_done = asyncio.Event()
+    
     # Register a callback to see packets in real-time
     def packet_callback(packet):
+        seen.add(packet.address)
+        if len(seen) >= TARGET_DEVICES:
+            scan_done.set()
         print(f"\n[PACKET] {packet.packet_type} from {packet.address}")
         print(f"  RSSI: {packet.rssi} dBm")
         if packet.metadata.get('name'):
@@ -27,12 +42,15 @@ async def test_macbook_scanner():
     mac_ble.register_callback(packet_callback)
     
     # Start scanning
-    print("\nStarting BLE scan for 10 seconds...")
+    print(f"\nStarting BLE scan for up to {SCAN_TIMEOUT:.0f} seconds...")
     print("You should see nearby BLE devices appear below:\n")
     await mac_ble.start_scanning()
     
-    # Let it scan for 10 seconds
-    await asyncio.sleep(10)
+    # Scan until enough devices are seen or the timeout expires
+    try:
+        await asyncio.wait_for(scan_done.wait(), timeout=SCAN_TIMEOUT)
+    except asyncio.TimeoutError:
+        pass
     
     # Stop scanning
     await mac_ble.stop_scanning()
@@ -6,34 +6,75 @@ from datetime import datetime
 from src.analyzers import PacketInspector, InspectionResult
 from src.interfaces.base import BLEPacket, DeviceType
 
+_NOW = datetime(2024, 1, 1, 0, 0, 0)
+_MBLE = DeviceType.MACBOOK_BLE
+
+# Test payloads, built once at import
+_SAMPLE = bytes.fromhex("080001020304")
+_ATT = bytes.fromhex("08000102")  # ATT Read Request
+_L2CAP = bytes.fromhex("040004000800")  # L2CAP with ATT CID
+_ADV = bytes.fromhex("020106")
+_PAIRING = bytes.fromhex("01000000")
+_RANGE32 = bytes(range(32))  # 32 distinct bytes: high entropy, two hex-dump rows
+_LARGE = bytes(252)
+_SHORT = bytes.fromhex("0102")
+
+
+@pytest.fixture(scope="module")
+def packet_template():
+    """BLE packet validated once; tests derive variants with model_copy(update=...)"""
+    return BLEPacket(
+        timestamp=_NOW,
+        source=_MBLE,
+        address="AA:BB:CC:DD:EE:FF",
+        rssi=-65,
+        data=bytes(),
+        packet_type="data"
+    )
+
+
+@pytest.fixture(scope="module")
+def inspector():
+    """Packet inspector shared by the module; history is reset before each test"""
+    return PacketInspector()
+
+
+def test_inspector_creation():
+    """Test inspector initialization"""
+    inspector = PacketInspector()
+    assert inspector is not None
+    assert inspector.parsers == {}
+    assert len(inspector.packet_history) == 0
+    assert inspector.max_history == 1000
+
+
+def test_history_bound(packet_template):
+    """Test history keeps only the newest max_history results"""
+    inspector = PacketInspector(max_history=2)
+    for i in range(3):
+        inspector.inspect_packet(packet_template.model_copy(update={"data": bytes([i])}))
+    
+    assert inspector.max_history == 2
+    assert [r.raw_hex[6:8] for r in inspector.packet_history] == ["01", "02"]
+    with pytest.raises(AttributeError):
+        inspector.max_history = 10
+
 
 class TestPacketInspector:
     """Test packet inspector functionality"""
     
-    @pytest.fixture
-    def inspector(self):
-        """Create a packet inspector instance"""
-        return PacketInspector()
+    @pytest.fixture(autouse=True)
+    def _reset(self, inspector):
+        """Start each test with an empty history"""
+        inspector.reset()
     
     @pytest.fixture
-    def sample_packet(self):
+    def sample_packet(self, packet_template):
         """Create a sample BLE packet"""
-        return BLEPacket(
-            timestamp=datetime.now(),
-            source=DeviceType.MACBOOK_BLE,
-            address="AA:BB:CC:DD:EE:FF",
-            rssi=-65,
-            data=bytes([0x08, 0x00, 0x01, 0x02, 0x03, 0x04]),
-            packet_type="data",
-            metadata={"channel": 37}
-        )
-    
-    def test_inspector_creation(self, inspector):
-        """Test inspector initialization"""
-        assert inspector is not None
-        assert inspector.parsers == {}
-        assert inspector.packet_history == []
-        assert inspector.max_history == 1000
+        return packet_template.model_copy(update={
+            "data": _SAMPLE,
+            "metadata": {"channel": 37}
+        })
     
     def test_basic_inspection(self, inspector, sample_packet):
         """Test basic packet inspection"""
@@ -48,114 +89,69 @@ class TestPacketInspector:
     
     def test_hex_dump(self, inspector):
         """Test hex dump generation"""
-        data = bytes(range(32))
-        hex_dump = inspector._to_hex_dump(data)
+        hex_dump = inspector._to_hex_dump(_RANGE32)
         
         assert "0000:" in hex_dump
         assert "0010:" in hex_dump
         assert "00 01 02 03" in hex_dump
         assert len(hex_dump.split('\n')) == 2
     
-    def test_protocol_detection(self, inspector):
+    @pytest.mark.parametrize("data,packet_type,expected", [
+        (_ATT, "data", "ATT"),
+        (_L2CAP, "data", "L2CAP_ATT"),
+        (_ADV, "advertisement", "ADV"),
+    ], ids=["att", "l2cap_att", "adv"])
+    def test_protocol_detection(self, inspector, packet_template, data, packet_type, expected):
         """Test protocol detection"""
-        # ATT packet
-        att_packet = BLEPacket(
-            timestamp=datetime.now(),
-            source=DeviceType.MACBOOK_BLE,
-            address="AA:BB:CC:DD:EE:FF",
-            rssi=-65,
-            data=bytes([0x08, 0x00, 0x01, 0x02]),  # ATT Read Request
-            packet_type="data"
-        )
-        assert inspector._detect_protocol(att_packet) == "ATT"
-        
-        # L2CAP packet
-        l2cap_packet = BLEPacket(
-            timestamp=datetime.now(),
-            source=DeviceType.MACBOOK_BLE,
-            address="AA:BB:CC:DD:EE:FF",
-            rssi=-65,
-            data=bytes([0x04, 0x00, 0x04, 0x00, 0x08, 0x00]),  # L2CAP with ATT CID
-            packet_type="data"
-        )
-        assert inspector._detect_protocol(l2cap_packet) == "L2CAP_ATT"
-        
-        # Advertisement packet
-        adv_packet = BLEPacket(
-            timestamp=datetime.now(),
-            source=DeviceType.MACBOOK_BLE,
-            address="AA:BB:CC:DD:EE:FF",
-            rssi=-65,
-            data=bytes([0x02, 0x01, 0x06]),
-            packet_type="advertisement"
-        )
-        assert inspector._detect_protocol(adv_packet) == "ADV"
+        packet = packet_template.model_copy(update={"data": data, "packet_type": packet_type})
+        assert inspector._detect_protocol(packet) == expected
     
-    def test_security_analysis(self, inspector):
+    @pytest.mark.parametrize("data,flag", [
+        (_PAIRING, "pairing_request"),  # Pairing request packet
+        (_RANGE32, "encrypted"),  # High entropy data (possible encryption)
+    ], ids=["pairing_request", "encrypted"])
+    def test_security_analysis(self, inspector, packet_template, data, flag):
         """Test security flag detection"""
-        # Pairing request packet
-        pairing_packet = BLEPacket(
-            timestamp=datetime.now(),
-            source=DeviceType.MACBOOK_BLE,
-            address="AA:BB:CC:DD:EE:FF",
-            rssi=-65,
-            data=bytes([0x01, 0x00, 0x00, 0x00]),
-            packet_type="data"
-        )
-        flags = inspector._analyze_security(pairing_packet)
-        assert flags["pairing_request"] is True
-        
-        # High entropy data (possible encryption)
-        random_data = bytes(range(256))[:32]
-        encrypted_packet = BLEPacket(
-            timestamp=datetime.now(),
-            source=DeviceType.MACBOOK_BLE,
-            address="AA:BB:CC:DD:EE:FF",
-            rssi=-65,
-            data=random_data,
-            packet_type="data"
-        )
-        flags = inspector._analyze_security(encrypted_packet)
-        assert flags["encrypted"] is True
+        packet = packet_template.model_copy(update={"data": data})
+        assert inspector._analyze_security(packet)[flag] is True
     
-    def test_anomaly_detection(self, inspector):
+    @pytest.mark.parametrize("update,message", [
+        ({"data": _LARGE}, "exceeds BLE 4.2 maximum"),  # Oversized packet
+        ({"rssi": 5, "data": _SHORT}, "Unusual RSSI"),
+    ], ids=["oversized", "positive_rssi"])
+    def test_anomaly_detection(self, inspector, packet_template, update, message):
         """Test anomaly detection"""
-        # Oversized packet
-        large_packet = BLEPacket(
-            timestamp=datetime.now(),
-            source=DeviceType.MACBOOK_BLE,
-            address="AA:BB:CC:DD:EE:FF",
-            rssi=-65,
-            data=bytes(252),
-            packet_type="data"
-        )
-        warnings = inspector._check_anomalies(large_packet, {})
-        assert any("exceeds BLE 4.2 maximum" in w for w in warnings)
+        packet = packet_template.model_copy(update=update)
+        warnings = inspector._check_anomalies(packet, {})
+        assert any(message in w for w in warnings)
+    
+    def test_anomaly_detection_many_packets(self, inspector, packet_template):
+        """Test anomaly counts over a mixed run of packets"""
+        rssi_values = (5, -65, -120)  # positive, normal, very weak
+        packets = [
+            packet_template.model_copy(update={
+                "data": _LARGE if i % 7 == 0 else _SHORT,
+                "rssi": rssi_values[i % 3]
+            })
+            for i in range(1000)
+        ]
         
-        # Unusual RSSI
-        strong_packet = BLEPacket(
-            timestamp=datetime.now(),
-            source=DeviceType.MACBOOK_BLE,
-            address="AA:BB:CC:DD:EE:FF",
-            rssi=5,
-            data=bytes([0x01, 0x02]),
-            packet_type="data"
+        warnings = [inspector._check_anomalies(p, {}) for p in packets]
+        
+        expected = (
+            sum(len(p.data) > 251 for p in packets)
+            + sum(p.rssi > 0 or p.rssi < -100 for p in packets)
         )
-        warnings = inspector._check_anomalies(strong_packet, {})
-        assert any("Unusual RSSI" in w for w in warnings)
+        assert sum(len(w) for w in warnings) == expected
     
-    def test_packet_history(self, inspector):
+    def test_packet_history(self, inspector, packet_template):
         """Test packet history management"""
         # Add multiple packets
         for i in range(5):
-            packet = BLEPacket(
-                timestamp=datetime.now(),
-                source=DeviceType.MACBOOK_BLE,
-                address=f"AA:BB:CC:DD:EE:{i:02X}",
-                rssi=-65,
-                data=bytes([i]),
-                packet_type="data"
-            )
+            packet = packet_template.model_copy(update={
+                "address": f"AA:BB:CC:DD:EE:{i:02X}",
+                "data": bytes([i])
+            })
             inspector.inspect_packet(packet)
         
         assert len(inspector.packet_history) == 5
@@ -165,19 +161,17 @@ class TestPacketInspector:
         assert stats["total_packets"] == 5
         assert "protocols" in stats
         assert "security" in stats
+        
+        # Reset clears history
+        inspector.reset()
+        assert len(inspector.packet_history) == 0
+        assert inspector.get_statistics() == {"total_packets": 0}
     
-    def test_empty_packet_handling(self, inspector):
+    def test_empty_packet_handling(self, inspector, packet_template):
         """Test handling of empty packets"""
-        empty_packet = BLEPacket(
-            timestamp=datetime.now(),
-            source=DeviceType.MACBOOK_BLE,
-            address="AA:BB:CC:DD:EE:FF",
-            rssi=-65,
-            data=bytes(),
-            packet_type="data"
-        )
+        empty_packet = packet_template
         
         result = inspector.inspect_packet(empty_packet)
         assert result is not None
         assert result.fields["data_length"] == 0
-        assert result.protocol is None
\ No newline at end of file
+        assert result.protocol is None
@@ -1,27 +1,63 @@
 #!/usr/bin/env python3
 import asyncio
+import sys
+import time
+from collections import deque
 from bleak import BleakScanner
 from datetime import datetime
 
+SCAN_TIMEOUT = 10.0
+TARGET_DEVICES = 5
+FLUSH_INTERVAL = 0.1
+
 async def simple_ble_test():
     print("=== Simple BLE Test ===")
     print(f"Starting at {datetime.now()}\n")
     
     devices = {}
+    scan_done = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    
+    # The callback only records a monotonic timestamp; formatting and printing
+    # happen in batches on the flush timer
+    pending = deque()
+    wall_offset_ns = time.time_ns() - time.monotonic_ns()
+    
+    def flush():
+        lines = []
+        while pending:
+            address, name, rssi, ts_ns = pending.popleft()
+            stamp = datetime.fromtimestamp((ts_ns + wall_offset_ns) / 1e9).strftime('%H:%M:%S')
+            lines.append(f"[{stamp}] Found: {address} | {name or 'Unknown'} | RSSI: {rssi}\n")
+        if lines:
+            sys.stdout.write("".join(lines))
+    
+    def flush_periodically():
+        flush()
+        nonlocal flush_handle
+        flush_handle = loop.call_later(FLUSH_INTERVAL, flush_periodically)
     
     def detection_callback(device, advertisement_data):
         devices[device.address] = device
-        print(f"[{datetime.now().strftime('%H:%M:%S')}] Found: {device.address} | {device.name or 'Unknown'} | RSSI: {advertisement_data.rssi}")
+        if len(devices) >= TARGET_DEVICES:
+            scan_done.set()
+        pending.append((device.address, device.name, advertisement_data.rssi, time.monotonic_ns()))
     
     scanner = BleakScanner(detection_callback)
     
-    print("Starting scan for 10 seconds...")
+    print(f"Starting scan for up to {SCAN_TIMEOUT:.0f} seconds...")
     print("Make sure Bluetooth is enabled on your Mac!")
     print("-" * 50)
     
+    flush_handle = loop.call_later(FLUSH_INTERVAL, flush_periodically)
     await scanner.start()
-    await asyncio.sleep(10)
+    try:
+        await asyncio.wait_for(scan_done.wait(), timeout=SCAN_TIMEOUT)
+    except asyncio.TimeoutError:
+        pass
     await scanner.stop()
+    flush_handle.cancel()
+    flush()
     
     print("-" * 50)
     print(f"\nScan complete! Found {len(devices)} devices.")
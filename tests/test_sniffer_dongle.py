@@ -0,0 +1,75 @@
+"""
+Tests for sniffer dongle port auto-detection
+"""
+import time
+from typing import Optional
+
+import pytest
+
+from src.interfaces import sniffer_dongle
+from src.interfaces.sniffer_dongle import SnifferDongle
+
+
+class ConcreteSnifferDongle(SnifferDongle):
+    """SnifferDongle with the abstract GATT methods filled in"""
+    
+    async def read_characteristic(self, address: str, char_uuid: str) -> Optional[bytes]:
+        return None
+    
+    async def write_characteristic(self, address: str, char_uuid: str, data: bytes) -> bool:
+        return False
+
+
+def _probe(results):
+    """is_port_available stand-in: port -> (delay seconds, result or exception)"""
+    def _is_port_available(port):
+        delay, outcome = results[port]
+        time.sleep(delay)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+    return _is_port_available
+
+
+@pytest.fixture
+def dongle():
+    return ConcreteSnifferDongle()
+
+
+@pytest.fixture
+def ports(monkeypatch):
+    """Install candidate ports and their probe outcomes, in detection order"""
+    def _install(results):
+        monkeypatch.setattr(sniffer_dongle, "find_ble_sniffer_candidates", lambda: list(results))
+        monkeypatch.setattr(sniffer_dongle, "is_port_available", _probe(results))
+    return _install
+
+
+class TestAutoDetectPort:
+    """Test SnifferDongle._auto_detect_port"""
+    
+    async def test_no_candidates(self, dongle, ports):
+        ports({})
+        assert await dongle._auto_detect_port() is None
+    
+    async def test_first_available_candidate_wins(self, dongle, ports):
+        ports({"/dev/sniffer": (0.0, True), "/dev/bluetooth": (0.0, True)})
+        assert await dongle._auto_detect_port() == "/dev/sniffer"
+    
+    async def test_slow_earlier_candidate_beats_faster_later_one(self, dongle, ports):
+        ports({"/dev/sniffer": (0.5, True), "/dev/bluetooth": (0.0, True)})
+        assert await dongle._auto_detect_port() == "/dev/sniffer"
+    
+    @pytest.mark.parametrize("outcome", [False, OSError("busy")], ids=["unavailable", "error"])
+    async def test_falls_through_to_next_candidate(self, dongle, ports, outcome):
+        ports({"/dev/sniffer": (0.1, outcome), "/dev/bluetooth": (0.0, True)})
+        assert await dongle._auto_detect_port() == "/dev/bluetooth"
+    
+    async def test_hung_candidate_times_out(self, dongle, ports, monkeypatch):
+        monkeypatch.setattr(sniffer_dongle, "PORT_PROBE_TIMEOUT", 0.1)
+        ports({"/dev/sniffer": (0.5, True), "/dev/bluetooth": (0.0, True)})
+        assert await dongle._auto_detect_port() == "/dev/bluetooth"
+    
+    async def test_no_available_candidate(self, dongle, ports):
+        ports({"/dev/sniffer": (0.0, False), "/dev/bluetooth": (0.0, False)})
+        assert await dongle._auto_detect_port() is None
@@ -1,69 +1,113 @@
 #!/usr/bin/env python3
 """
 Test UI button functionality
+
+Probes the API endpoints behind the UI buttons against a live server (see the
+api_server fixture). After it passes, open http://localhost:7860 and:
+1. Click 'Start Scan' in Control tab
+2. Click 'Refresh Devices' in Devices tab
+3. Click 'Refresh Device List' in Service Explorer tab
+
+If buttons don't work, check browser console for errors (F12)
 """
-import requests
+import asyncio
+import subprocess
+import sys
 import time
-import json
+from pathlib import Path
 
-print("Testing BlueFusion UI Button Functionality")
-print("=" * 50)
+import httpx
+import pytest
+import websockets
 
-# Test 1: Check API is running
-print("\n1. Testing API Status...")
 try:
-    response = requests.get("http://localhost:8000/")
-    print(f"   ✅ API Running: {response.json()['status']}")
-except Exception as e:
-    print(f"   ❌ API Error: {e}")
-    print("   Make sure to run: python bluefusion.py start")
-    exit(1)
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
-# Test 2: Test Scan Start
-print("\n2. Testing Scan Start Button...")
-try:
-    response = requests.post("http://localhost:8000/scan/start",
-                           json={"interface": "both", "mode": "active"})
-    result = response.json()
-    print(f"   ✅ Scan Started: {result['status']}")
-    print(f"   Interfaces: {result.get('interfaces', {})}")
-except Exception as e:
-    print(f"   ❌ Scan Error: {e}")
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+API_URL = "http://localhost:8000"
+API_STARTUP_TIMEOUT = 15.0
 
-# Test 3: Wait and check devices
-print("\n3. Waiting for devices...")
-time.sleep(3)
 
-try:
-    response = requests.get("http://localhost:8000/devices?interface=both")
-    devices = response.json()
-    mac_count = len(devices.get('macbook', []))
-    sniff_count = len(devices.get('sniffer', []))
-    print(f"   ✅ Found {mac_count} devices on MacBook")
-    print(f"   ✅ Found {sniff_count} devices on Sniffer")
+def _api_is_up(client: httpx.Client) -> bool:
+    try:
+        client.get("/", timeout=0.2)
+        return True
+    except httpx.HTTPError:
+        return False
+
+
+@pytest.fixture(scope="session")
+def api_server():
+    """
+    Base URL of a running BlueFusion API
+    
+    Reuses a server already listening on :8000, otherwise starts uvicorn
+    once for the session and stops it afterwards.
+    """
+    process = None
+    with httpx.Client(base_url=API_URL) as client:
+        if not _api_is_up(client):
+            process = subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "src.api.fastapi_server:app", "--port", "8000"],
+                cwd=PROJECT_ROOT,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            deadline = time.monotonic() + API_STARTUP_TIMEOUT
+            while not _api_is_up(client):
+                if process.poll() is not None or time.monotonic() > deadline:
+                    process.terminate()
+                    pytest.fail("BlueFusion API did not start on :8000")
+                time.sleep(0.1)
     
-    if mac_count > 0:
-        print("\n   Sample devices:")
-        for device in devices['macbook'][:3]:
-            print(f"     - {device['address']} | {device.get('name', 'Unknown')} | {device['rssi']} dBm")
-except Exception as e:
-    print(f"   ❌ Device Error: {e}")
+    yield API_URL
+    
+    if process is not None:
+        process.terminate()
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+async def _probe_websocket(base_url: str):
+    ws_url = base_url.replace("http://", "ws://", 1) + "/stream"
+    async with websockets.connect(ws_url, open_timeout=1):
+        return True
+
+
+@pytest.mark.hardware
+async def test_all_endpoints(api_server):
+    """Probe status, scan start and stream endpoints concurrently, then list devices"""
+    async with httpx.AsyncClient(base_url=api_server, timeout=5.0) as client:
+        status, scan, ws_ok = await asyncio.gather(
+            client.get("/"),
+            client.post("/scan/start", params={"interface": "both", "mode": "active"}),
+            _probe_websocket(api_server),
+        )
+        # Devices only appear once the scan is running
+        devices = await client.get("/devices", params={"interface": "both"})
+    
+    # API status
+    assert status.status_code == 200
+    assert json_loads(status.content)["status"]
+    
+    # Scan start
+    assert scan.status_code == 200
+    assert "status" in json_loads(scan.content)
+    
+    # Device list
+    assert devices.status_code == 200
+    device_lists = json_loads(devices.content)
+    for device in device_lists.get("macbook", []) + device_lists.get("sniffer", []):
+        assert "address" in device
+        assert "rssi" in device
+    
+    # WebSocket endpoint
+    assert ws_ok
 
-# Test 4: Check WebSocket endpoint
-print("\n4. Testing WebSocket endpoint...")
-import websocket
-try:
-    ws = websocket.WebSocket()
-    ws.connect("ws://localhost:8000/stream")
-    print("   ✅ WebSocket connected")
-    ws.close()
-except Exception as e:
-    print(f"   ❌ WebSocket Error: {e}")
 
-print("\n" + "=" * 50)
-print("\n✅ API is working properly!")
-print("\nNow open http://localhost:7860 and:")
-print("1. Click 'Start Scan' in Control tab")
-print("2. Click 'Refresh Devices' in Devices tab")
-print("3. Click 'Refresh Device List' in Service Explorer tab")
-print("\nIf buttons don't work, check browser console for errors (F12)")
\ No newline at end of file
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-n", "0", "--run-hardware"])